@@ -1,13 +1,25 @@
+"""
+HSV Range Finder: interactive HSV color range tuning for OpenCV.
+
+Performance note: the slider-driven filter is memory-bound, moving a few
+bytes per preview pixel per redraw with almost no arithmetic. The preview is
+therefore kept as three contiguous H, S and V planes (cv2.split, i.e. a
+structure-of-arrays layout) rather than one interleaved HSV image, so each
+per-channel lookup streams a single plane linearly and a slider that moves
+one channel only re-reads that channel's plane. Keep new per-pixel work on
+these contiguous planes and preallocated buffers.
+"""
+
 # Import necessary libraries
 import cv2
 from tkinter import *
 from tkinter import messagebox, filedialog
 from PIL import Image, ImageTk
 import numpy as np
-import pyperclip
+import functools
 import platform
 import os
-from typing import Optional, Tuple, List, Any, Union
+from typing import Optional, Tuple, List, Dict, Any, Union
 
 # Application Configuration
 class Config:
@@ -17,8 +29,7 @@ class Config:
     This class centralizes all configuration values to improve maintainability
     and make it easier to adjust application behavior.
     """
-    # Update intervals and timing
-    UPDATE_INTERVAL = 50  # milliseconds - reduced for better responsiveness
+    # Update timing
     DEBOUNCE_DELAY = 50  # milliseconds - reduced for better responsiveness
     
     # UI Layout
@@ -82,11 +93,28 @@ class HSVRangeFinder:
         self.show_binary: bool = False
         
         # Performance optimization attributes
-        self._cached_hsv_image: Optional[np.ndarray] = None
-        self._last_processed_bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None
-        self._cached_processed_images: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._preview_bgr: Optional[np.ndarray] = None
+        self._loaded_umat: Optional[cv2.UMat] = None
+        self._mask_buffer: Optional[np.ndarray] = None
+        self._plane_masks: Optional[List[np.ndarray]] = None
+        self._plane_mask_keys: List[Optional[Tuple[int, int, int]]] = [None, None, None]
+        self._pair_mask: Optional[np.ndarray] = None
+        self._pair_mask_key: Optional[Tuple[Tuple[int, Tuple[int, int, int]], ...]] = None
+        self._filtered_buffer: Optional[np.ndarray] = None
+        self._hsv_planes: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._channel_luts: List[np.ndarray] = [np.zeros(256, dtype=np.uint8) for _ in range(3)]
+        self._lut_index: np.ndarray = np.arange(256, dtype=np.uint8)
+        self._cached_rgb_image: Optional[np.ndarray] = None
+        self._image_generation: int = 0  # bumped whenever the working image changes
+        self._original_photo_key: Optional[Tuple[int, Tuple[int, int]]] = None
+        self._last_processed_key: Optional[Tuple[int, ...]] = None
+        self._last_display_key: Optional[Tuple[Any, ...]] = None
+        self._cached_processed_images: Optional[Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]] = None
         self._debounce_timer: Optional[str] = None
+        self._slider_idle_job: Optional[str] = None
+        self._pending_slider_keys: set = set()
         self._last_hsv_change_time: float = 0.0
+        self._frame_sizes: Dict[Widget, Tuple[int, int]] = {}
         
         # Initialize UI components (will be set during setup)
         self.contentFrame: Frame
@@ -99,6 +127,14 @@ class HSVRangeFinder:
         self.resultFrame: LabelFrame
         self.toggleFrame: Frame
         
+        # HSV bounds as uint8 arrays, ready to pass to cv2.inRange
+        self._lower: np.ndarray = np.array(Config.DEFAULT_LOWER_HSV, dtype=np.uint8)
+        self._upper: np.ndarray = np.array(Config.DEFAULT_UPPER_HSV, dtype=np.uint8)
+        self._bound_slots: Dict[str, Tuple[np.ndarray, int]] = {}
+        
+        # Per-channel widgets keyed by 'lh', 'ls', ..., 'uv': (variable, show label, entry, max value)
+        self._channels: Dict[str, Tuple[DoubleVar, Label, Entry, int]] = {}
+        
         # HSV slider variables
         self.l_h: DoubleVar
         self.l_s: DoubleVar
@@ -126,6 +162,18 @@ class HSVRangeFinder:
         self._create_main_frames()
         self._create_camera_frames()
         self._create_control_frames()
+        self._register_channels()
+    
+    def _register_channels(self) -> None:
+        """Build the per-channel widget table used by the slider and entry handlers."""
+        self._channels = {
+            'lh': (self.l_h, self.lhShow, self.lhEntry, Config.HSV_HUE_MAX),
+            'ls': (self.l_s, self.lsShow, self.lsEntry, Config.HSV_SAT_VAL_MAX),
+            'lv': (self.l_v, self.lvShow, self.lvEntry, Config.HSV_SAT_VAL_MAX),
+            'uh': (self.u_h, self.uhShow, self.uhEntry, Config.HSV_HUE_MAX),
+            'us': (self.u_s, self.usShow, self.usEntry, Config.HSV_SAT_VAL_MAX),
+            'uv': (self.u_v, self.uvShow, self.uvEntry, Config.HSV_SAT_VAL_MAX)
+        }
     
     def _create_main_frames(self) -> None:
         """Create the main layout frames."""
@@ -150,6 +198,7 @@ class HSVRangeFinder:
         self.mainCameraFrame.columnconfigure(0, weight=Config.GRID_WEIGHT_LIGHT)
         self.vidLabel1 = Label(self.mainCameraFrame)
         self.vidLabel1.grid(row=0, column=0, sticky='nsew')
+        self.mainCameraFrame.bind('<Configure>', self._on_frame_configure)
 
         # Result Camera Frame (filtered/binary image)
         self.resultCameraFrame = LabelFrame(self.contentFrame, text='Filtered Image')
@@ -159,6 +208,7 @@ class HSVRangeFinder:
         self.resultCameraFrame.columnconfigure(0, weight=Config.GRID_WEIGHT_LIGHT)
         self.vidLabel2 = Label(self.resultCameraFrame)
         self.vidLabel2.grid(row=0, column=0, sticky='nsew')
+        self.resultCameraFrame.bind('<Configure>', self._on_frame_configure)
     
     def _create_control_frames(self):
         """Create the control panel frames and components."""
@@ -200,6 +250,18 @@ class HSVRangeFinder:
         self.u_h.set(Config.DEFAULT_UPPER_HSV[0])
         self.u_s.set(Config.DEFAULT_UPPER_HSV[1])
         self.u_v.set(Config.DEFAULT_UPPER_HSV[2])
+        
+        # Map each channel key to its slot in the uint8 bound arrays
+        self._bound_slots = {
+            'lh': (self._lower, 0),
+            'ls': (self._lower, 1),
+            'lv': (self._lower, 2),
+            'uh': (self._upper, 0),
+            'us': (self._upper, 1),
+            'uv': (self._upper, 2)
+        }
+        for channel in range(3):
+            self._rebuild_channel_lut(channel)
     
     def _create_sliders(self):
         """Create the HSV adjustment sliders with reduced code duplication."""
@@ -214,15 +276,15 @@ class HSVRangeFinder:
         
         # Create sliders using helper method to reduce duplication
         self._create_hsv_slider_row(0, "Lower", [
-            ("Hue", self.l_h, Config.HSV_HUE_MAX, self.lh_changed, self.lh_entry_changed),
-            ("Saturation", self.l_s, Config.HSV_SAT_VAL_MAX, self.ls_changed, self.ls_entry_changed),
-            ("Value", self.l_v, Config.HSV_SAT_VAL_MAX, self.lv_changed, self.lv_entry_changed)
+            ("Hue", self.l_h, Config.HSV_HUE_MAX),
+            ("Saturation", self.l_s, Config.HSV_SAT_VAL_MAX),
+            ("Value", self.l_v, Config.HSV_SAT_VAL_MAX)
         ])
         
         self._create_hsv_slider_row(1, "Upper", [
-            ("Hue", self.u_h, Config.HSV_HUE_MAX, self.uh_changed, self.uh_entry_changed),
-            ("Saturation", self.u_s, Config.HSV_SAT_VAL_MAX, self.us_changed, self.us_entry_changed),
-            ("Value", self.u_v, Config.HSV_SAT_VAL_MAX, self.uv_changed, self.uv_entry_changed)
+            ("Hue", self.u_h, Config.HSV_HUE_MAX),
+            ("Saturation", self.u_s, Config.HSV_SAT_VAL_MAX),
+            ("Value", self.u_v, Config.HSV_SAT_VAL_MAX)
         ])
         
         # Store entry widgets for later initialization
@@ -230,8 +292,11 @@ class HSVRangeFinder:
     
     def _create_hsv_slider_row(self, row, prefix, slider_configs):
         """Create a row of HSV sliders with labels, sliders, and entries."""
-        for col_offset, (name, variable, max_val, slider_cmd, entry_cmd) in enumerate(slider_configs):
+        for col_offset, (name, variable, max_val) in enumerate(slider_configs):
             col_base = col_offset * 3
+            prefix_short = 'l' if prefix == 'Lower' else 'u'
+            name_short = name.lower()[0]  # h, s, v
+            key = f"{prefix_short}{name_short}"
             
             # Create label
             label = Label(self.sliderFrame, text=f'{prefix} {name}:')
@@ -240,21 +305,20 @@ class HSVRangeFinder:
             # Create slider
             slider = Scale(self.sliderFrame, orient='horizontal', 
                           from_=Config.HSV_HUE_MIN if 'Hue' in name else Config.HSV_SAT_VAL_MIN,
-                          to=max_val, command=slider_cmd, variable=variable)
+                          to=max_val, command=functools.partial(self._slider_changed, key),
+                          variable=variable)
             slider.grid(row=row, column=col_base + 1)
             
             # Create entry field
             entry = Entry(self.sliderFrame, width=Config.ENTRY_WIDTH)
             entry.grid(row=row, column=col_base + 2, padx=2)
-            entry.bind('<Return>', entry_cmd)
-            entry.bind('<FocusOut>', entry_cmd)
+            entry.bind('<Return>', functools.partial(self._entry_changed, key))
+            entry.bind('<FocusOut>', functools.partial(self._entry_changed, key))
             
             # Store references for later use (matching original naming convention)
-            prefix_short = 'l' if prefix == 'Lower' else 'u'
-            name_short = name.lower()[0]  # h, s, v
-            setattr(self, f"{prefix_short}{name_short}Label", label)
-            setattr(self, f"{prefix_short}{name_short}Slider", slider)
-            setattr(self, f"{prefix_short}{name_short}Entry", entry)
+            setattr(self, f"{key}Label", label)
+            setattr(self, f"{key}Slider", slider)
+            setattr(self, f"{key}Entry", entry)
     
     def _initialize_entry_fields(self):
         """Initialize entry fields with default values."""
@@ -325,12 +389,19 @@ class HSVRangeFinder:
     # Method to copy the lower HSV range to clipboard
     def get_lowerRange(self):
         lowerRange = '{},{},{}'.format(self.get_lh(), self.get_ls(), self.get_lv())
-        pyperclip.copy(lowerRange)
+        self._copy_to_clipboard(lowerRange)
 
     # Method to copy the upper HSV range to clipboard
     def get_upperRange(self):
         upperRange = '{},{},{}'.format(self.get_uh(), self.get_us(), self.get_uv())
-        pyperclip.copy(upperRange)
+        self._copy_to_clipboard(upperRange)
+    
+    def _copy_to_clipboard(self, text: str) -> None:
+        """Copy text with Tk's own clipboard, in-process and without spawning xclip/xsel."""
+        self.window.clipboard_clear()
+        self.window.clipboard_append(text)
+        # Let Tk take ownership of the selection before returning to the event loop
+        self.window.update()
 
 
     def load_image(self) -> None:
@@ -366,6 +437,7 @@ class HSVRangeFinder:
             if image is not None:
                 self.loaded_image = image
                 self._invalidate_cache()  # Clear cache when new image is loaded
+                self._build_preview()
                 self.hsv_changed = True
                 self.process_and_display_image()
                 
@@ -452,6 +524,69 @@ class HSVRangeFinder:
             messagebox.showerror("Error", f"Error reading image file: {str(e)}")
             return None
     
+    def _build_preview(self) -> None:
+        """
+        Downscale the loaded image to the largest display frame and convert it once.
+        
+        All slider-driven filtering runs on this preview instead of the
+        full-resolution image, so its cost follows the display size rather
+        than the source size. The HSV and RGB conversions are cached here so
+        slider updates never repeat them.
+        """
+        height, width = self.loaded_image.shape[:2]
+        preview_size = self._get_preview_size()
+        
+        # With OpenCL the resize and both conversions run on the GPU through
+        # the transparent API; the source is uploaded once per image and only
+        # the preview-sized results are read back
+        use_opencl = cv2.ocl.useOpenCL()
+        if use_opencl and self._loaded_umat is None:
+            self._loaded_umat = cv2.UMat(self.loaded_image)
+        source = self._loaded_umat if use_opencl else self.loaded_image
+        
+        if preview_size == (width, height):
+            preview = source
+            self._preview_bgr = self.loaded_image
+        else:
+            preview = cv2.resize(source, preview_size, interpolation=cv2.INTER_AREA)
+            self._preview_bgr = preview.get() if use_opencl else preview
+        
+        # Keep H, S and V as separate planes for the per-channel lookup tables
+        hsv_planes = cv2.split(cv2.cvtColor(preview, cv2.COLOR_BGR2HSV))
+        rgb_image = cv2.cvtColor(preview, cv2.COLOR_BGR2RGB)
+        if use_opencl:
+            hsv_planes = [plane.get() for plane in hsv_planes]
+            rgb_image = rgb_image.get()
+        self._hsv_planes = tuple(hsv_planes)
+        self._cached_rgb_image = rgb_image
+        
+        # Output buffers reused by every redraw until the preview is rebuilt
+        self._mask_buffer = np.empty(self._preview_bgr.shape[:2], dtype=np.uint8)
+        self._plane_masks = [np.empty_like(self._mask_buffer) for _ in range(3)]
+        self._pair_mask = np.empty_like(self._mask_buffer)
+        self._filtered_buffer = np.empty_like(self._preview_bgr)
+        
+        # Results cached for a previous preview no longer match it
+        self._image_generation += 1
+    
+    def _get_preview_size(self) -> Tuple[int, int]:
+        """Get the loaded image size scaled down to fit the largest display frame."""
+        height, width = self.loaded_image.shape[:2]
+        scale = 0.0
+        for frame in (self.mainCameraFrame, self.resultCameraFrame):
+            frame_w, frame_h = self._get_frame_size(frame)
+            scale = max(scale, min(frame_w / width, frame_h / height))
+        
+        # Never upscale the working image
+        scale = min(1.0, scale)
+        return (max(1, int(width * scale)), max(1, int(height * scale)))
+    
+    def _preview_is_stale(self) -> bool:
+        """Check whether the display frames have grown past the preview size."""
+        if self._preview_bgr is None:
+            return True
+        return self._get_preview_size()[0] > self._preview_bgr.shape[1]
+    
     def _handle_load_error(self, error_message):
         """Handle image loading errors."""
         messagebox.showerror("Error", error_message)
@@ -471,8 +606,20 @@ class HSVRangeFinder:
                 
             lower_bound, upper_bound = hsv_bounds
             
+            # Rebuild the working preview if the display frames have grown
+            if self._preview_is_stale():
+                self._build_preview()
+            
+            # Nothing to do when the bounds, preview, view and frame sizes all
+            # match what is already on screen
+            display_key = (self._processing_key(lower_bound, upper_bound), self.show_binary,
+                           self._get_frame_size(self.mainCameraFrame), 
+                           self._get_frame_size(self.resultCameraFrame))
+            if display_key == self._last_display_key:
+                return
+            
             # Process image safely
-            processed_images = self._process_image_safely(self.loaded_image.copy(), 
+            processed_images = self._process_image_safely(self._preview_bgr, 
                                                         lower_bound, upper_bound)
             if processed_images is None:
                 return
@@ -481,29 +628,31 @@ class HSVRangeFinder:
             
             # Display images safely
             self._display_images_safely(original_image, filtered_frame, binary)
+            self._last_display_key = display_key
             
         except Exception as e:
             self._handle_processing_error(f"Error processing image: {str(e)}")
+        finally:
+            # The display now reflects the current state
+            self.hsv_changed = False
     
     def _clear_image_displays(self):
         """Clear the image display labels."""
-        self.vidLabel1.config(image='')
-        self.vidLabel2.config(image='')
+        for label in (self.vidLabel1, self.vidLabel2):
+            label.config(image='')
+            label.image = None
+            label.photos = {}
+        self._last_display_key = None
     
     def _get_validated_hsv_bounds(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
-        """Get and validate HSV bounds from sliders."""
+        """Get and validate the uint8 HSV bounds kept in sync by the slider handlers."""
         try:
-            lower_bound = np.array([self.l_h.get(), self.l_s.get(), self.l_v.get()])
-            upper_bound = np.array([self.u_h.get(), self.u_s.get(), self.u_v.get()])
-            
-            # Validate bounds
-            if np.any(lower_bound < 0) or np.any(upper_bound < 0):
-                print("Warning: HSV bounds contain negative values")
-                return None
+            # Values are range-checked on input, so the uint8 bounds are never negative
+            lower_bound, upper_bound = self._lower, self._upper
                 
-            if np.any(lower_bound > upper_bound):
-                print("Warning: Lower HSV bounds are greater than upper bounds")
-                # Don't return None here as this is a valid use case in some scenarios
+            # Lower > upper is a wrap-around range for hue, but empty for S and V
+            if np.any(lower_bound[1:] > upper_bound[1:]):
+                print("Warning: Lower saturation/value bounds are greater than upper bounds")
                 
             return lower_bound, upper_bound
             
@@ -511,32 +660,31 @@ class HSVRangeFinder:
             print(f"Error getting HSV bounds: {str(e)}")
             return None
     
-    def _process_image_safely(self, image: np.ndarray, lower_bound: np.ndarray, upper_bound: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    def _process_image_safely(self, image: np.ndarray, lower_bound: np.ndarray, upper_bound: np.ndarray) -> Optional[Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]]:
         """Process image with error handling and caching optimization."""
         try:
-            # Check if we can use cached results (disabled for better real-time updates)
-            # if self._can_use_cached_results(lower_bound, upper_bound):
-            #     return self._cached_processed_images
-            
-            # Use cached HSV conversion if available, otherwise convert
-            if self._cached_hsv_image is None or not self._is_same_image(image):
-                hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-                self._cached_hsv_image = hsv
+            # Reuse the previous mask when the bounds have not changed
+            if self._can_use_cached_results(lower_bound, upper_bound):
+                _, filtered_frame, mask = self._cached_processed_images
             else:
-                hsv = self._cached_hsv_image
+                # The mask is already the 0/255 binary image
+                mask = self._compute_mask(lower_bound, upper_bound)
+                filtered_frame = None
             
-            # Create mask and filtered image
-            mask = cv2.inRange(hsv, lower_bound, upper_bound)
-            filtered_frame = cv2.bitwise_and(image, image, mask=mask)
-            
-            # Create binary image
-            gray = cv2.cvtColor(filtered_frame, cv2.COLOR_BGR2GRAY)
-            _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY)
+            # Only build the filtered image when it is the one being shown
+            if filtered_frame is None and not self.show_binary:
+                # Mask the cached RGB preview so the result is display-ready
+                # without a per-redraw BGR->RGB pass. A masked copy is a plain
+                # per-pixel select (cheaper than a masked bitwise_and) but
+                # leaves pixels outside the mask untouched in dst, so clear
+                # the reused buffer first.
+                self._filtered_buffer.fill(0)
+                filtered_frame = cv2.copyTo(self._cached_rgb_image, mask, dst=self._filtered_buffer)
             
             # Cache the results
-            processed_images = (image, filtered_frame, binary)
+            processed_images = (image, filtered_frame, mask)
             self._cached_processed_images = processed_images
-            self._last_processed_bounds = (lower_bound.copy(), upper_bound.copy())
+            self._last_processed_key = self._processing_key(lower_bound, upper_bound)
             
             return processed_images
             
@@ -544,37 +692,105 @@ class HSVRangeFinder:
             print(f"Error processing image: {str(e)}")
             return None
     
-    def _can_use_cached_results(self, lower_bound: np.ndarray, upper_bound: np.ndarray) -> bool:
-        """Check if we can use cached processing results."""
-        if (self._cached_processed_images is None or 
-            self._last_processed_bounds is None):
-            return False
+    def _compute_mask(self, lower_bound: np.ndarray, upper_bound: np.ndarray) -> np.ndarray:
+        """
+        Build the HSV range mask from cached per-channel plane masks.
+        
+        Each channel has a 256-entry table that is 255 inside its bounds,
+        rebuilt by _store_bound only when that bound changes. A cv2.LUT pass
+        turns each HSV plane into a plane mask, which is cached and only
+        recomputed when that channel's bounds move, so a typical slider drag
+        redoes one lookup pass and the bitwise_and that combines the planes.
+        All outputs go to preallocated buffers, and the result is the same as
+        cv2.inRange on the interleaved HSV image.
         
-        cached_lower, cached_upper = self._last_processed_bounds
+        Channels are visited value first and hue last. A channel whose bounds
+        span its full range cannot reject any pixel and is skipped, and an
+        empty saturation or value range rejects every pixel without looking
+        at the other planes. Hue ranges with lower > upper wrap around.
         
-        # Convert to integers for exact comparison (HSV values should be integers)
-        lower_int = np.round(lower_bound).astype(int)
-        upper_int = np.round(upper_bound).astype(int)
-        cached_lower_int = np.round(cached_lower).astype(int)
-        cached_upper_int = np.round(cached_upper).astype(int)
+        With a single restricting channel its plane mask is returned as is.
+        When all three restrict, the AND of the two planes that did not move
+        is cached, so dragging one slider costs a single bitwise_and.
+        """
+        mask = self._mask_buffer
+        channel_max = (Config.HSV_HUE_MAX, Config.HSV_SAT_VAL_MAX, Config.HSV_SAT_VAL_MAX)
+        active_channels = []
+        moved_channels = []
+        
+        for channel in (2, 1, 0):
+            low, high = int(lower_bound[channel]), int(upper_bound[channel])
+            if low > high and channel != 0:
+                mask.fill(0)
+                return mask
+            if low == 0 and high >= channel_max[channel]:
+                continue
+            
+            # Only rerun the lookup for planes whose bounds moved
+            plane_key = (self._image_generation, low, high)
+            if self._plane_mask_keys[channel] != plane_key:
+                cv2.LUT(self._hsv_planes[channel], self._channel_luts[channel], 
+                        dst=self._plane_masks[channel])
+                self._plane_mask_keys[channel] = plane_key
+                moved_channels.append(channel)
+            active_channels.append(channel)
         
-        return (np.array_equal(lower_int, cached_lower_int) and 
-                np.array_equal(upper_int, cached_upper_int))
+        planes = self._plane_masks
+        
+        # No channel restricts the range, so every pixel is selected
+        if not active_channels:
+            mask.fill(255)
+            return mask
+        if len(active_channels) == 1:
+            return planes[active_channels[0]]
+        if len(active_channels) == 2:
+            return cv2.bitwise_and(planes[active_channels[0]], planes[active_channels[1]], dst=mask)
+        
+        # Combine the moved plane with the cached AND of the other two,
+        # rebuilding that pair only when one of its planes changed too
+        last = moved_channels[0] if len(moved_channels) == 1 else self._pair_last_channel()
+        pair = tuple(channel for channel in active_channels if channel != last)
+        pair_key = tuple((channel, self._plane_mask_keys[channel]) for channel in pair)
+        if self._pair_mask_key != pair_key:
+            cv2.bitwise_and(planes[pair[0]], planes[pair[1]], dst=self._pair_mask)
+            self._pair_mask_key = pair_key
+        return cv2.bitwise_and(self._pair_mask, planes[last], dst=mask)
     
-    def _is_same_image(self, image: np.ndarray) -> bool:
-        """Check if the current image is the same as the cached one."""
-        if self.loaded_image is None or self._cached_hsv_image is None:
+    def _pair_last_channel(self) -> int:
+        """Get the channel left out of the cached pair mask, defaulting to hue."""
+        if self._pair_mask_key is None:
+            return 0
+        paired = {channel for channel, _ in self._pair_mask_key}
+        return ({0, 1, 2} - paired).pop()
+    
+    def _can_use_cached_results(self, lower_bound: np.ndarray, upper_bound: np.ndarray) -> bool:
+        """Check if we can use cached processing results."""
+        if (self._cached_processed_images is None or 
+            self._last_processed_key is None):
             return False
         
-        # Quick shape comparison first
-        return (image.shape == self.loaded_image.shape and 
-                np.array_equal(image, self.loaded_image))
+        return self._processing_key(lower_bound, upper_bound) == self._last_processed_key
+    
+    def _processing_key(self, lower_bound: np.ndarray, upper_bound: np.ndarray) -> Tuple[int, ...]:
+        """Flatten the image generation and bounds into a tuple of ints for cheap cache comparisons."""
+        return (self._image_generation, *lower_bound.tolist(), *upper_bound.tolist())
     
     def _invalidate_cache(self) -> None:
         """Invalidate all cached images when a new image is loaded."""
-        self._cached_hsv_image = None
+        self._image_generation += 1
+        self._preview_bgr = None
+        self._loaded_umat = None
+        self._mask_buffer = None
+        self._plane_masks = None
+        self._pair_mask = None
+        self._pair_mask_key = None
+        self._filtered_buffer = None
+        self._hsv_planes = None
+        self._cached_rgb_image = None
+        self._original_photo_key = None
         self._cached_processed_images = None
-        self._last_processed_bounds = None
+        self._last_processed_key = None
+        self._last_display_key = None
     
     def _display_images_safely(self, original_image, filtered_frame, binary):
         """Display processed images with error handling."""
@@ -583,14 +799,18 @@ class HSVRangeFinder:
             size1 = self._get_frame_size(self.mainCameraFrame)
             size2 = self._get_frame_size(self.resultCameraFrame)
             
-            # Display original image
-            self._display_image_in_label(original_image, self.vidLabel1, size1, is_bgr=True)
+            # The original only changes on load or resize, so keep its photo otherwise
+            original_photo_key = (self._image_generation, size1)
+            if original_photo_key != self._original_photo_key:
+                self._display_image_in_label(self._cached_rgb_image, self.vidLabel1, size1)
+                self._original_photo_key = original_photo_key
             
-            # Display filtered or binary image based on toggle
-            if self.show_binary:
-                self._display_image_in_label(binary, self.vidLabel2, size2, is_bgr=False)
-            else:
-                self._display_image_in_label(filtered_frame, self.vidLabel2, size2, is_bgr=True)
+            # Display filtered or binary image based on toggle; both views are
+            # keyed on the processing key, so toggling back to a view whose
+            # bounds have not moved just swaps its photo back in
+            result_image = binary if self.show_binary else filtered_frame
+            self._display_image_in_label(result_image, self.vidLabel2, size2, 
+                                         content_key=self._last_processed_key)
                 
         except Exception as e:
             print(f"Error displaying images: {str(e)}")
@@ -601,10 +821,14 @@ class HSVRangeFinder:
             default = Config.DEFAULT_FRAME_SIZE
             
         try:
-            # Force update to get current dimensions
-            frame.update_idletasks()
-            w = frame.winfo_width()
-            h = frame.winfo_height()
+            # Prefer the size recorded by the last <Configure> event; only
+            # force a layout pass when the frame has not been mapped yet
+            if frame in self._frame_sizes:
+                w, h = self._frame_sizes[frame]
+            else:
+                frame.update_idletasks()
+                w = frame.winfo_width()
+                h = frame.winfo_height()
             
             # If not yet rendered or too small, calculate from window size
             if w < 50 or h < 50:
@@ -628,16 +852,20 @@ class HSVRangeFinder:
         except Exception:
             return default
     
-    def _display_image_in_label(self, image, label, size, is_bgr=True):
-        """Display a single image in a label with proper conversion and aspect ratio preservation."""
+    def _display_image_in_label(self, image, label, size, content_key=None):
+        """
+        Display an RGB or single-channel image in a label, preserving its aspect ratio.
+        
+        The label keeps one PhotoImage per PIL mode, so switching between the
+        RGB filtered view and the grayscale mask reuses both. If content_key
+        matches the key the mode's photo was last drawn with, the image is
+        assumed unchanged and the photo is shown without resizing or pasting.
+        """
         try:
-            # Convert color space if needed
-            if is_bgr and len(image.shape) == 3:
-                display_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            elif not is_bgr and len(image.shape) == 2:
-                display_image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-            else:
-                display_image = image
+            # Everything shown is already RGB (built once per preview) or a
+            # single-channel mask shown as grayscale ('L'), so no per-redraw
+            # color conversion is needed
+            display_image = image
             
             # Calculate the best fit size while maintaining aspect ratio
             original_height, original_width = display_image.shape[:2]
@@ -652,56 +880,118 @@ class HSVRangeFinder:
             new_width = int(original_width * scale)
             new_height = int(original_height * scale)
             
-            # Convert to PIL and resize with aspect ratio preservation
-            pil_image = Image.fromarray(display_image)
-            pil_image = pil_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # The preview is already built at display size, so skip the resize
+            # when the fitted size only differs from it by rounding
+            skip_resize = abs(new_width - original_width) <= 1 and abs(new_height - original_height) <= 1
+            output_size = (original_width, original_height) if skip_resize else (new_width, new_height)
             
-            # Convert to PhotoImage and display
-            photo_image = ImageTk.PhotoImage(image=pil_image)
-            label.config(image=photo_image)
-            label.image = photo_image  # Keep a reference to prevent garbage collection
+            photos = getattr(label, 'photos', None)
+            if photos is None:
+                photos = label.photos = {}
+            mode = 'L' if display_image.ndim == 2 else 'RGB'
+            photo_image, photo_key = photos.get(mode, (None, None))
+            if photo_image is not None and (photo_image.width(), photo_image.height()) != output_size:
+                photo_image = None
+            
+            # Nothing changed since this photo was drawn, so only make sure it is shown
+            if photo_image is not None and content_key is not None and photo_key == content_key:
+                self._show_photo(label, photo_image)
+                return
+            
+            if skip_resize:
+                resized = display_image
+            else:
+                # Resize into a buffer kept on the label, reallocated only on size changes
+                buffer_shape = (new_height, new_width) + display_image.shape[2:]
+                resize_buffer = getattr(label, 'resize_buffer', None)
+                if resize_buffer is None or resize_buffer.shape != buffer_shape:
+                    resize_buffer = np.empty(buffer_shape, dtype=np.uint8)
+                    label.resize_buffer = resize_buffer
+                
+                # Resize with OpenCV: area averaging when shrinking, bilinear when enlarging
+                interpolation = cv2.INTER_AREA if new_width < original_width else cv2.INTER_LINEAR
+                resized = cv2.resize(display_image, (new_width, new_height), dst=resize_buffer, 
+                                     interpolation=interpolation)
+            pil_image = Image.fromarray(resized)
+            
+            # Paste into the existing PhotoImage of this mode when the size is
+            # unchanged, instead of allocating a new Tk image handle on every redraw
+            # (pasting converts to the photo's mode, so an 'L' photo would grey out RGB)
+            if photo_image is not None:
+                photo_image.paste(pil_image)
+            else:
+                photo_image = ImageTk.PhotoImage(image=pil_image)
+            photos[mode] = (photo_image, content_key)
+            self._show_photo(label, photo_image)
             
         except Exception as e:
             print(f"Error displaying single image: {str(e)}")
     
+    def _show_photo(self, label: Label, photo_image: ImageTk.PhotoImage) -> None:
+        """Point a label at a photo unless it already shows it."""
+        if getattr(label, 'image', None) is not photo_image:
+            label.config(image=photo_image)
+            label.image = photo_image  # Keep a reference to prevent garbage collection
+    
     def _handle_processing_error(self, error_message):
         """Handle image processing errors."""
         print(error_message)
         messagebox.showerror("Processing Error", 
             "Error processing image. Please check your image and HSV values.")
 
-    # Periodically update the display to reflect slider changes
-    def update_frame(self) -> None:
-        """Update frame with debouncing for better performance."""
-        if self.hsv_changed:
-            # Cancel any pending debounced update
-            if self._debounce_timer:
-                self.window.after_cancel(self._debounce_timer)
-            
-            # Schedule a debounced update
-            self._debounce_timer = self.window.after(Config.DEBOUNCE_DELAY, self._debounced_update)
-            
-        self.window.after(Config.UPDATE_INTERVAL, self.update_frame)
-    
     def _debounced_update(self) -> None:
         """Perform the actual image processing update after debounce delay."""
+        self._debounce_timer = None
         if self.hsv_changed:
             self.process_and_display_image()
-            self.hsv_changed = False
-        self._debounce_timer = None
     
     def _mark_hsv_changed(self) -> None:
-        """Mark HSV values as changed with timestamp for performance optimization."""
+        """Mark HSV values as changed and schedule a single debounced redraw."""
         import time
         self.hsv_changed = True
         self._last_hsv_change_time = time.time()
+        
+        # Event-driven: at most one redraw is queued, and none while idle
+        if self._debounce_timer is None:
+            self._debounce_timer = self.window.after(Config.DEBOUNCE_DELAY, self._debounced_update)
 
-    # HSV value validation and update helpers
-    def _validate_and_update(self, entry_widget, variable, display_label, min_val, max_val):
+    def _store_bound(self, key: str, value: int) -> bool:
+        """Write a channel value into the uint8 bound arrays and refresh its channel LUT.
+        
+        Returns True if the stored bound changed.
+        """
+        bounds, index = self._bound_slots[key]
+        if bounds[index] == value:
+            return False
+        bounds[index] = value
+        self._rebuild_channel_lut(index)
+        return True
+    
+    def _rebuild_channel_lut(self, channel: int) -> None:
+        """Fill a channel's lookup table with 255 inside its current bounds.
+        
+        A hue range with lower > upper wraps around 179 -> 0 (e.g. 170..10 for
+        red), so it selects both ends of the hue circle in the same table.
+        """
+        low, high = int(self._lower[channel]), int(self._upper[channel])
+        index = self._lut_index
+        if channel == 0 and low > high:
+            selected = (index >= low) | (index <= high)
+        else:
+            selected = (index >= low) & (index <= high)
+        # One broadcast comparison over all 256 entries, written in place
+        np.multiply(selected, 255, out=self._channel_luts[channel], casting='unsafe')
+    
+    # HSV slider and entry handlers, dispatched by channel key ('lh', 'ls', ..., 'uv')
+    def _entry_changed(self, key: str, _event: Optional[Event] = None) -> bool:
         """Validate entry input and update variable and display"""
+        variable, display_label, entry_widget, max_val = self._channels[key]
         try:
             value = int(entry_widget.get())
-            if min_val <= value <= max_val:
+            if 0 <= value <= max_val:
+                # Return and FocusOut often repeat the current value; skip the redraw then
+                if not self._store_bound(key, value):
+                    return True
                 variable.set(value)
                 display_label.configure(text=str(value))
                 self._mark_hsv_changed()
@@ -710,73 +1000,67 @@ class HSVRangeFinder:
             pass
         return False
     
-    def _update_entry_from_slider(self, entry_widget, variable, display_label):
-        """Update entry field and display when slider changes"""
-        value = int(variable.get())
-        display_label.configure(text=str(value))
-        entry_widget.delete(0, END)
-        entry_widget.insert(0, str(value))
+    def _slider_changed(self, key: str, _value: Optional[str] = None) -> None:
+        """Queue an entry field and display update; applied once Tk is idle"""
+        variable = self._channels[key][0]
+        bounds, index = self._bound_slots[key]
+        
+        # Sub-integer slider motion does not change the value that was last applied
+        if key not in self._pending_slider_keys and int(variable.get()) == bounds[index]:
+            return
+        
+        # Coalesce bursts of slider events into a single update and redraw
+        self._pending_slider_keys.add(key)
+        if self._slider_idle_job is None:
+            self._slider_idle_job = self.window.after_idle(self._apply_pending_slider_updates)
+    
+    def _apply_pending_slider_updates(self) -> None:
+        """Update entry fields and displays for queued slider changes"""
+        self._slider_idle_job = None
+        pending = self._pending_slider_keys
+        self._pending_slider_keys = set()
+        
+        changed = False
+        for key in pending:
+            variable, display_label, entry_widget, _ = self._channels[key]
+            value = int(variable.get())
+            # The slider may have come back to the last applied value
+            if not self._store_bound(key, value):
+                continue
+            changed = True
+            display_label.configure(text=str(value))
+            entry_widget.delete(0, END)
+            entry_widget.insert(0, str(value))
+        
+        if not changed:
+            return
+        
+        # Redraw at once on the first change of a drag for responsiveness; the
+        # debounce timer this arms absorbs the rest of the drag into at most
+        # one trailing filter pass per Config.DEBOUNCE_DELAY
+        redraw_now = self._debounce_timer is None and self.loaded_image is not None
         self._mark_hsv_changed()
-        # Process immediately for slider changes to improve responsiveness
-        if self.loaded_image is not None:
+        if redraw_now:
             self.process_and_display_image()
-    
-    # Lower HSV handlers
-    def lh_entry_changed(self, event):
-        self._validate_and_update(self.lhEntry, self.l_h, self.lhShow, 0, Config.HSV_HUE_MAX)
-
-    def lh_changed(self, event):
-        self._update_entry_from_slider(self.lhEntry, self.l_h, self.lhShow)
-
-    def ls_entry_changed(self, event):
-        self._validate_and_update(self.lsEntry, self.l_s, self.lsShow, 0, Config.HSV_SAT_VAL_MAX)
-
-    def ls_changed(self, event):
-        self._update_entry_from_slider(self.lsEntry, self.l_s, self.lsShow)
-
-    def lv_entry_changed(self, event):
-        self._validate_and_update(self.lvEntry, self.l_v, self.lvShow, 0, Config.HSV_SAT_VAL_MAX)
 
-    def lv_changed(self, event):
-        self._update_entry_from_slider(self.lvEntry, self.l_v, self.lvShow)
-    
-    # Upper HSV handlers
-    def uh_entry_changed(self, event):
-        self._validate_and_update(self.uhEntry, self.u_h, self.uhShow, 0, Config.HSV_HUE_MAX)
-
-    def uh_changed(self, event):
-        self._update_entry_from_slider(self.uhEntry, self.u_h, self.uhShow)
-
-    def us_entry_changed(self, event):
-        self._validate_and_update(self.usEntry, self.u_s, self.usShow, 0, Config.HSV_SAT_VAL_MAX)
-
-    def us_changed(self, event):
-        self._update_entry_from_slider(self.usEntry, self.u_s, self.usShow)
-
-    def uv_entry_changed(self, event):
-        self._validate_and_update(self.uvEntry, self.u_v, self.uvShow, 0, Config.HSV_SAT_VAL_MAX)
-
-    def uv_changed(self, event):
-        self._update_entry_from_slider(self.uvEntry, self.u_v, self.uvShow)
-
-    # Getter methods for HSV values
+    # Getter methods for HSV values, read from the uint8 bounds without a Tk round-trip
     def get_lh(self) -> str:
-        return '{:.0f}'.format(self.l_h.get())
+        return str(int(self._lower[0]))
 
     def get_ls(self) -> str:
-        return '{:.0f}'.format(self.l_s.get())
+        return str(int(self._lower[1]))
 
     def get_lv(self) -> str:
-        return '{:.0f}'.format(self.l_v.get())
+        return str(int(self._lower[2]))
 
     def get_uh(self) -> str:
-        return '{:.0f}'.format(self.u_h.get())
+        return str(int(self._upper[0]))
 
     def get_us(self) -> str:
-        return '{:.0f}'.format(self.u_s.get())
+        return str(int(self._upper[1]))
 
     def get_uv(self) -> str:
-        return '{:.0f}'.format(self.u_v.get())
+        return str(int(self._upper[2]))
     
     def cleanup(self) -> None:
         """
@@ -785,40 +1069,40 @@ class HSVRangeFinder:
         Called when the user closes the window. Properly destroys
         the Tkinter window and releases any resources.
         """
+        # Cancel queued redraws so they do not fire against a destroyed window
+        for job in (self._debounce_timer, self._slider_idle_job):
+            if job is not None:
+                self.window.after_cancel(job)
+        self._debounce_timer = None
+        self._slider_idle_job = None
+        
         self.window.destroy()
 
     def run(self) -> None:
         """
         Start the HSV Range Finder application.
         
-        Initializes the update loop for real-time image processing,
-        sets up proper window close handling, and starts the main
+        Sets up proper window close handling and starts the main
         Tkinter event loop. This method blocks until the application
         is closed by the user.
         
-        The update loop runs at the interval defined in Config.UPDATE_INTERVAL
-        and includes debouncing for optimal performance.
+        Redraws are event-driven: input handlers mark the display dirty
+        and schedule one debounced update after Config.DEBOUNCE_DELAY,
+        so no timer runs while the user is idle.
         """
-        # Start updating the frame
-        self.update_frame()
-        
         # Bind the cleanup method to the window's close event
         self.window.protocol("WM_DELETE_WINDOW", self.cleanup)
         
-        # Bind window resize event for dynamic image scaling
-        self.window.bind('<Configure>', self._on_window_resize)
-        
         # Run the Tkinter event loop
         self.window.mainloop()
 
-    def _on_window_resize(self, event):
-        """Handle window resize events to update image display dynamically."""
-        # Only process resize events for the main window, not child widgets
-        if event.widget == self.window and self.loaded_image is not None:
-            # Add a small delay to avoid excessive updates during dragging
-            if hasattr(self, '_resize_timer') and self._resize_timer:
-                self.window.after_cancel(self._resize_timer)
-            self._resize_timer = self.window.after(100, self.process_and_display_image)
+    def _on_frame_configure(self, event) -> None:
+        """Record image frame sizes and mark the display dirty when they change."""
+        size = (event.width, event.height)
+        if self._frame_sizes.get(event.widget) != size:
+            self._frame_sizes[event.widget] = size
+            if self.loaded_image is not None:
+                self._mark_hsv_changed()
 
     def toggle_result_view(self):
         self.show_binary = not self.show_binary
@@ -828,7 +1112,7 @@ class HSVRangeFinder:
         else:
             self.resultCameraFrame.config(text='Filtered Image')
             self.toggleBtn.config(text='Show Binary Mask')
-        self.hsv_changed = True
+        # show_binary is part of the display key, so this only swaps the result view
         self.process_and_display_image()
 
 gui = HSVRangeFinder()